@@ -1,24 +1,68 @@
 import os
 import re
+import json
 import sys
+import queue
+import atexit
+import shutil
+import hashlib
+import functools
 import pathlib
+import tempfile
 import requests
 import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import scrolledtext
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlparse, urlsplit
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from unidecode import unidecode 
 
+# lxml's C parser is much faster than the pure-Python one; fall back if it's missing
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
 # -------- Configuration --------
 ROOT_DIR = pathlib.Path("Learning/French/Larousse")
 BASE_URL = "https://www.larousse.fr"
+DICTIONARY_URL = f"{BASE_URL}/dictionnaires/"
+# Assets shared between words (site CSS/JS) are downloaded once into here
+CACHE_DIR = ROOT_DIR / "_cache"
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# mkstemp makes owner-only files; cached assets get the usual umask-based mode instead.
+# The umask can only be read by setting it, so do that once here, before any threads start.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+CACHE_FILE_MODE = 0o666 & ~_UMASK
+MAX_WORKERS = 16  # Parallel asset downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read from the network at a time
+WRITE_BUFFER_SIZE = 1024 * 1024  # Keeps write syscalls coarse
+# The dictionary entry we scrape; matches the lookup order in scrape_larousse
+ARTICLE_SELECTOR = "article.article_bilingue, div.content.fr-en, article"
+
+# One shared session so asset downloads reuse keep-alive connections
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+# The default python-requests agent gets a stripped-down page
+session.headers["User-Agent"] = "Mozilla/5.0"
+# Kept for the life of the program so back-to-back scrapes don't respawn threads
+download_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="asset")
 
 # --- Helper Functions ---
 
 def ensure_paths(word: str):
-    """Sets up the directory structure for the word."""
+    """Sets up the directory structure for the word.
+
+    Only the word folder is created here; the asset folders are created by
+    scrape_larousse once it knows the page has assets of that kind.
+    """
     word_dir = ROOT_DIR / word
     # Only the folders present in your original working version
     audio_dir = word_dir / "audio"
@@ -26,19 +70,27 @@ def ensure_paths(word: str):
     js_dir = word_dir / "js"
     
     word_dir.mkdir(parents=True, exist_ok=True)
-    audio_dir.mkdir(parents=True, exist_ok=True)
-    css_dir.mkdir(parents=True, exist_ok=True)
-    js_dir.mkdir(parents=True, exist_ok=True)
     
     return word_dir, audio_dir, css_dir, js_dir
 
+_WS_RE = re.compile(r"\s+")
+
 def normalize_space(text: str) -> str:
     """Cleans up whitespace in text."""
-    return re.sub(r"\s+", " ", text).strip()
+    return _WS_RE.sub(" ", text).strip()
+
+_BASE_SPLIT = urlsplit(BASE_URL)
+_BASE_ORIGIN = f"{_BASE_SPLIT.scheme}://{_BASE_SPLIT.netloc}"
 
 def absolute_url(path_or_url: str) -> str:
     """Ensures a URL is absolute."""
-    return path_or_url if path_or_url.startswith("http") else urljoin(BASE_URL, path_or_url)
+    if path_or_url.startswith("http"):
+        return path_or_url
+    # Site-relative paths are the common case and only need the origin prepended;
+    # protocol-relative "//host/..." URLs still go through urljoin
+    if path_or_url.startswith("/") and not path_or_url.startswith("//"):
+        return _BASE_ORIGIN + path_or_url
+    return urljoin(BASE_URL, path_or_url)
 
 # --- MODIFIED: Added 'direction' argument and fixed typo ---
 def build_url(word_or_url: str, direction: str) -> str:
@@ -46,15 +98,107 @@ def build_url(word_or_url: str, direction: str) -> str:
     if word_or_url.startswith("http"):
         return word_or_url
     # CORRECTED to use the dynamic 'direction' variable
-    return f"{BASE_URL}/dictionnaires/{direction}/{word_or_url}" 
+    return f"{DICTIONARY_URL}{direction}/{word_or_url}" 
 # --- END MODIFIED ---
 
-def download_asset(url: str, out_path: pathlib.Path) -> bool:
-    """Downloads a single asset (CSS, JS, audio) to a specific path."""
+def link_from_cache(cached: pathlib.Path, out_path: pathlib.Path):
+    """Points out_path at a cached asset: relative symlink, else hardlink, else a copy.
+
+    The link is built under a temporary name and moved into place, so an
+    existing file at out_path is replaced atomically and never written through.
+    """
+    tmp_path = out_path.with_name(f".{out_path.name}.{threading.get_ident()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        try:
+            os.symlink(os.path.relpath(cached, out_path.parent), tmp_path)
+        except FileExistsError:
+            raise
+        except OSError:
+            # Symlinks need extra privileges on Windows
+            try:
+                os.link(cached, tmp_path)
+            except FileExistsError:
+                raise
+            except OSError:
+                shutil.copyfile(cached, tmp_path)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+# Cache keys already checked against the server during this run
+_fresh_cache_keys = set()
+
+def read_cache_meta(meta_path: pathlib.Path) -> dict:
+    """Reads the ETag/Last-Modified sidecar of a cached asset ({} if missing or unreadable)."""
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def refresh_cache_entry(session: requests.Session, url: str, cached: pathlib.Path, meta_path: pathlib.Path):
+    """Makes sure the cache holds the current copy of url, re-downloading only if it changed.
+
+    If a cached copy exists and revalidating it fails (timeout, reset, 5xx), the
+    cached copy is kept; only a 404/410 means the asset is really gone.
+    """
+    headers = {}
+    revalidating = cached.exists()
+    if revalidating:
+        meta = read_cache_meta(meta_path)
+        if not meta:
+            return  # The server gave no validators, so keep the cached copy as-is
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        # Stream to disk so large audio/JS files are never held in memory whole
+        with session.get(url, timeout=20, stream=True, headers=headers) as r:
+            if r.status_code == 304:
+                return
+            r.raise_for_status()
+            # Write to a temp file first so the cache never holds a partial download
+            fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR)
+            try:
+                with open(fd, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                os.chmod(tmp_name, CACHE_FILE_MODE)
+                os.replace(tmp_name, cached)
+            except BaseException:
+                pathlib.Path(tmp_name).unlink(missing_ok=True)
+                raise
+
+            meta = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+    except requests.RequestException as e:
+        status = e.response.status_code if e.response is not None else None
+        if not revalidating or status in (404, 410):
+            raise
+        print(f"[warn] Could not revalidate {url}, using cached copy: {e}")
+        return
+
+    meta = {k: v for k, v in meta.items() if v}
+    if meta:
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    else:
+        meta_path.unlink(missing_ok=True)
+
+def download_asset(session: requests.Session, url: str, out_path: pathlib.Path) -> bool:
+    """Downloads a single asset (CSS, JS, audio) to a specific path, via the shared cache.
+
+    A cached copy is revalidated with a conditional GET once per run; after
+    that, other words reuse it without any request.
+    """
+    key = hashlib.sha1(url.encode()).hexdigest()
+    cached = CACHE_DIR / key
     try:
-        r = requests.get(url, timeout=20)
-        r.raise_for_status()
-        out_path.write_bytes(r.content)
+        if key not in _fresh_cache_keys:
+            refresh_cache_entry(session, url, cached, CACHE_DIR / f"{key}.meta")
+            _fresh_cache_keys.add(key)
+        link_from_cache(cached, out_path)
         return True
     except Exception as e:
         # Suppress "404" warnings for cleaner output
@@ -62,11 +206,15 @@ def download_asset(url: str, out_path: pathlib.Path) -> bool:
             print(f"[warn] Failed to download {url}: {e}")
         return False
 
+# Shared CSS/JS URLs repeat across words, so their parsed form is memoized
+_cached_urlparse = functools.lru_cache(maxsize=2048)(urlparse)
+
+@functools.lru_cache(maxsize=1024)
 def get_local_path(url: str, asset_dir: pathlib.Path, prefix: str = "", idx: int = 0) -> pathlib.Path:
     """Creates a predictable local file path for a downloaded asset."""
     try:
         # Strip query parameters (like ?v=123) from filename
-        parsed_path = urlparse(url).path
+        parsed_path = _cached_urlparse(url).path
         parsed_name_with_query = pathlib.Path(parsed_path).name 
         parsed_name = parsed_name_with_query.split('?')[0].split('#')[0] 
 
@@ -84,8 +232,90 @@ def get_local_path(url: str, asset_dir: pathlib.Path, prefix: str = "", idx: int
     except Exception:
         return asset_dir / f"{prefix}_{idx}.asset"
 
+# --- Shared Browser ---
+
+# Launching Chromium takes seconds, so one browser is kept for all scrapes.
+# Playwright's sync API only works on the thread that started it; the UI runs
+# every scrape on the same worker thread for that reason.
+_PW = None
+_BROWSER = None
+
+def get_browser():
+    """Returns the shared headless Chromium, launching it on first use (or after a crash)."""
+    global _PW, _BROWSER
+    if _PW is None:
+        _PW = sync_playwright().start()
+    if _BROWSER is None or not _BROWSER.is_connected():
+        _BROWSER = _PW.chromium.launch(headless=True)
+    return _BROWSER
+
+def close_browser():
+    """Closes the shared browser and stops Playwright, if they were started."""
+    global _PW, _BROWSER
+    if _PW is None:
+        return
+    try:
+        if _BROWSER is not None:
+            _BROWSER.close()
+        _PW.stop()
+    except Exception as e:
+        print(f"[warn] Failed to close browser: {e}")
+    finally:
+        _PW = _BROWSER = None
+
+atexit.register(close_browser)
+
+# Chromium never needs to fetch these: the page is only read for its HTML, and
+# stylesheets are downloaded separately by download_asset
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_HOSTS = ("googletagmanager.com", "google-analytics.com", "doubleclick.net",
+                 "facebook.com", "facebook.net")
+
+def is_blocked_host(url: str) -> bool:
+    """True if url points at one of BLOCKED_HOSTS or a subdomain of it."""
+    host = urlsplit(url).hostname or ""
+    return any(host == blocked or host.endswith("." + blocked) for blocked in BLOCKED_HOSTS)
+
+def block_unneeded_requests(route):
+    """Playwright route handler that aborts assets and trackers, letting the rest through."""
+    request = route.request
+    # Never abort the page itself, whatever its URL contains
+    if request.resource_type != "document" and \
+       (request.resource_type in BLOCKED_RESOURCE_TYPES or is_blocked_host(request.url)):
+        route.abort()
+    else:
+        route.continue_()
+
 # --- Core Scraping Logic (Updated) ---
 
+# Static part of the saved page, between the stylesheet links and the article
+PAGE_STYLE = b"""
+    <style>
+        body { margin: 24px; background: #fff; }
+        /* Ensure the play icon link is visible and clickable */
+        a[href$=".mp3"] { text-decoration: none; font-size: 1.2em; color: inherit; margin-right: 5px; } 
+        /* Remove font-family that was causing strange symbols */
+        span.icon-speaker { font-family: unset; } 
+    </style>
+</head>
+<body>
+    """
+
+def fetch_static_html(url: str):
+    """Fetches the page without a browser; returns None if the entry needs JS to render.
+
+    The raw bytes are returned so BeautifulSoup picks the encoding from the page's
+    <meta charset> (requests falls back to ISO-8859-1 when the header has none).
+    """
+    try:
+        resp = session.get(url, timeout=20)
+    except Exception as e:
+        print(f"[warn] Direct fetch failed, falling back to Playwright: {e}")
+        return None
+    if resp.ok and b"article_bilingue" in resp.content:
+        return resp.content
+    return None
+
 # --- MODIFIED: Added 'direction' argument ---
 def scrape_larousse(word_or_url: str, direction: str):
     """
@@ -95,7 +325,7 @@ def scrape_larousse(word_or_url: str, direction: str):
     
     # 1. Get the original word (stem)
     if word_or_url.startswith("http"):
-        raw_word = pathlib.Path(urlparse(word_or_url).path).stem
+        raw_word = pathlib.Path(_cached_urlparse(word_or_url).path).stem
     else:
         raw_word = word_or_url
         
@@ -114,19 +344,31 @@ def scrape_larousse(word_or_url: str, direction: str):
     print(f"[info] Scraping '{raw_word}' from {url}")
     print(f"[info] Saving to directory: {word_dir}")
 
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            # Increase timeout for complex pages
-            page.goto(url, wait_until="networkidle", timeout=60000) 
-            html = page.content()
-            browser.close()
-    except Exception as e:
-        print(f"[error] Playwright failed: {e}")
-        return
+    # Most entries are server-rendered; only start the browser when they aren't
+    html = fetch_static_html(url)
+    if html is None:
+        print("[info] Entry not in static HTML, rendering with Playwright...")
+        try:
+            # A fresh context per scrape keeps cookies/storage isolated between words
+            ctx = get_browser().new_context()
+            ctx.route("**/*", block_unneeded_requests)
+            try:
+                page = ctx.new_page()
+                # Ads and trackers keep the network busy, so wait for the entry itself
+                # rather than "networkidle"
+                page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                try:
+                    page.wait_for_selector(ARTICLE_SELECTOR, timeout=15000)
+                except PlaywrightTimeoutError:
+                    pass  # No entry on this page; reported below as "No article found"
+                html = page.content()
+            finally:
+                ctx.close()
+        except Exception as e:
+            print(f"[error] Playwright failed: {e}")
+            return
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     
     article = soup.find("article", class_="article_bilingue") or \
               soup.find("div", class_="content fr-en") or \
@@ -137,7 +379,7 @@ def scrape_larousse(word_or_url: str, direction: str):
         return
 
     print("[info] Removing internal links...")
-    for a_tag in article.find_all('a'):
+    for a_tag in article.select('a'):
         a_tag.name = "span" 
         if a_tag.has_attr('href'):
             del a_tag['href']
@@ -145,53 +387,94 @@ def scrape_larousse(word_or_url: str, direction: str):
             del a_tag['target']
     
     # Asset downloading logic (from the user's working version)
-    
-    print("[info] Downloading CSS...")
+    # Collect every asset first, then fetch them all in parallel.
+    # One walk over the whole page finds the CSS and JS tags...
+    css_tags, js_tags = [], []
+    for tag in soup.descendants:
+        name = getattr(tag, "name", None)
+        if name == "link" and "stylesheet" in tag.get("rel", []) and tag.get("href"):
+            css_tags.append(tag)
+        elif name == "script" and tag.get("src"):
+            js_tags.append(tag)
+    # ...while audio only counts inside the article, so that search stays scoped to it
+    audio_tags = article.select('audio[src]:not([src=""])')
+
+    # Skip empty folders (and their mkdir calls) for asset kinds the page doesn't have
+    for asset_dir, tags in ((css_dir, css_tags), (js_dir, js_tags), (audio_dir, audio_tags)):
+        if tags:
+            asset_dir.mkdir(exist_ok=True)
+
+    # Each job is (kind, tag, url, local_path).
+    jobs = []
+    for idx, link in enumerate(css_tags):
+        orig_href = absolute_url(link['href'])
+        jobs.append(("css", link, orig_href, get_local_path(orig_href, css_dir, "style", idx)))
+
+    for idx, script in enumerate(js_tags):
+        orig_src = absolute_url(script['src'])
+        jobs.append(("js", script, orig_src, get_local_path(orig_src, js_dir, "script", idx)))
+
+    for idx, audio in enumerate(audio_tags):
+        orig_src = absolute_url(audio['src'])
+        jobs.append(("audio", audio, orig_src, get_local_path(orig_src, audio_dir, word, idx)))
+
+    # Several tags can map to one local file (the same src twice, or /a/main.css and
+    # /b/main.css); fetch each file once so no two pool threads write the same path
+    unique_jobs = {}
+    for job in jobs:
+        unique_jobs.setdefault(job[3], job)
+
+    results = []
+    if unique_jobs:
+        print(f"[info] Downloading {len(unique_jobs)} asset(s) (CSS, JS, Audio)...")
+        downloaded = dict(zip(unique_jobs, download_pool.map(
+            lambda job: download_asset(session, job[2], job[3]), unique_jobs.values())))
+        results = [downloaded[job[3]] for job in jobs]
+
+    # Rewrite the tree only after the pool is done; BeautifulSoup is not thread-safe.
     css_files_found = 0
-    for idx, link in enumerate(soup.find_all('link', rel='stylesheet')):
-        if link.get('href'):
-            orig_href = absolute_url(link['href'])
-            local_path = get_local_path(orig_href, css_dir, "style", idx)
-            
-            if download_asset(orig_href, local_path):
-                link['href'] = os.path.relpath(local_path, word_dir)
+    js_files_found = 0
+    audio_files_found = 0
+    audio_links = []
+    # Serialized as they are rewritten, so the output step needn't search the tree again
+    head_links = []
+    body_scripts = []
+
+    # Every asset of a kind sits in the same folder, so resolve each folder's
+    # relative path once instead of calling relpath per file
+    rel_dirs = {
+        "css": os.path.relpath(css_dir, word_dir),
+        "js": os.path.relpath(js_dir, word_dir),
+        "audio": os.path.relpath(audio_dir, word_dir),
+    }
+
+    for (kind, tag, _, local_path), ok in zip(jobs, results):
+        local_href = f"{rel_dirs[kind]}/{local_path.name}"
+        if kind == "css":
+            if ok:
+                tag['href'] = local_href
+                head_links.append(tag.encode())
                 css_files_found += 1
             else:
-                link.decompose()
-    
-    print("[info] Downloading JS...")
-    js_files_found = 0
-    for idx, script in enumerate(soup.find_all('script')):
-        if script.get('src'):
-            orig_src = absolute_url(script['src'])
-            local_path = get_local_path(orig_src, js_dir, "script", idx)
-            
-            if download_asset(orig_src, local_path):
-                script['src'] = os.path.relpath(local_path, word_dir)
+                tag.decompose()
+        elif kind == "js":
+            if ok:
+                tag['src'] = local_href
+                body_scripts.append(tag.encode())
                 js_files_found += 1
             else:
-                script.decompose()
-    
-    print("[info] Downloading Audio...")
-    audio_files_found = 0
-    audio_links = []
-    
-    for idx, audio in enumerate(article.find_all('audio')): 
-        if audio.get('src'):
-            orig_src = absolute_url(audio['src'])
-            local_path = get_local_path(orig_src, audio_dir, word, idx)
-            
-            if download_asset(orig_src, local_path):
+                tag.decompose()
+        else:
+            if ok:
                 audio_files_found += 1
-                audio_links.append(os.path.relpath(local_path, word_dir))
-            
+                audio_links.append(local_href)
             # Remove the original <audio> element as it is useless without Larousse's JS
-            audio.decompose()
+            tag.decompose()
 
     # --- HACK FIX: Replace speaker icons and create playable links ---
     print("[info] Replacing speaker icons with '▶️' links to local audio.")
     audio_index = 0
-    for speaker_icon in article.find_all('span', class_='icon-speaker'):
+    for speaker_icon in article.select('span.icon-speaker'):
         if audio_index < len(audio_links):
             # Create a direct link to the local MP3 file
             link_tag = soup.new_tag("a", href=audio_links[audio_index], target="_blank", title="Play Audio (Offline)")
@@ -207,29 +490,27 @@ def scrape_larousse(word_or_url: str, direction: str):
 
     title = soup.find("title").string or f"Entry for {word}"
     
-    final_html = f"""<!DOCTYPE html>
+    # Build the page as UTF-8 bytes so each tag is serialized and encoded only once
+    final_html = b"".join([
+        f"""<!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
     <title>{title}</title>
-    {os.linesep.join(str(link) for link in soup.head.find_all('link', rel='stylesheet'))}
-    <style>
-        body {{ margin: 24px; background: #fff; }}
-        /* Ensure the play icon link is visible and clickable */
-        a[href$=".mp3"] {{ text-decoration: none; font-size: 1.2em; color: inherit; margin-right: 5px; }} 
-        /* Remove font-family that was causing strange symbols */
-        span.icon-speaker {{ font-family: unset; }} 
-    </style>
-</head>
-<body>
-    {str(article)}
-    {os.linesep.join(str(script) for script in soup.find_all('script') if script.get('src'))}
-</body>
-</html>"""
+    """.encode("utf-8"),
+        b"\n".join(head_links),
+        PAGE_STYLE,
+        # BeautifulSoup builds its own tree even with the lxml parser, so there is no
+        # lxml element to hand to etree.tostring; encode() is the single serialization
+        article.encode(formatter="minimal"),
+        b"\n    ",
+        b"\n".join(body_scripts),
+        b"\n</body>\n</html>",
+    ])
 
     # Use the sanitized 'word' for the output filename
     out_html = word_dir / f"{word}.html"
-    out_html.write_text(final_html, encoding="utf-8")
+    out_html.write_bytes(final_html)
 
     print(f"\n[done] Saved: {out_html}")
     print(f"[done] Audio: {audio_files_found} file(s) - Playable via '▶️' link.")
@@ -241,22 +522,71 @@ def scrape_larousse(word_or_url: str, direction: str):
 # -------- Simple Tkinter UI (Updated) --------
 
 class TextRedirector:
-    """Redirects stdout to a tkinter Text widget"""
+    """Redirects stdout to a tkinter Text widget.
+
+    write() may be called from the scrape worker, but Tk widgets must only be
+    touched from the main thread, so text is queued and flushed from there.
+    """
+    POLL_MS = 50
+
     def __init__(self, widget):
         self.widget = widget
+        self.q = queue.Queue()
+        self.widget.after(self.POLL_MS, self._drain)
 
     def write(self, s):
-        self.widget.configure(state='normal')
-        self.widget.insert('end', s)
-        self.widget.see('end')
-        self.widget.configure(state='disabled')
+        self.q.put(s)
 
     def flush(self):
         pass 
 
+    def _drain(self):
+        """Writes everything queued so far in one insert, then reschedules itself."""
+        chunks = []
+        try:
+            while True:
+                chunks.append(self.q.get_nowait())
+        except queue.Empty:
+            pass
+        if chunks:
+            self.widget.configure(state='normal')
+            self.widget.insert('end', ''.join(chunks))
+            self.widget.see('end')
+            self.widget.configure(state='disabled')
+        self.widget.after(self.POLL_MS, self._drain)
+
+# All scrapes run one at a time on a single worker thread, which owns the shared browser
+scrape_jobs = queue.Queue()
+# Widget updates requested by the worker; only the Tk main thread may run them
+ui_calls = queue.Queue()
+
+def process_ui_calls(widget):
+    """Runs widget updates queued by the worker, then reschedules itself (main thread)"""
+    while True:
+        try:
+            call = ui_calls.get_nowait()
+        except queue.Empty:
+            break
+        call()
+    widget.after(TextRedirector.POLL_MS, process_ui_calls, widget)
+
+def scrape_worker():
+    """Runs queued scrape jobs until it receives None, then closes the browser"""
+    while True:
+        job = scrape_jobs.get()
+        if job is None:
+            close_browser()
+            return
+        # A failing job must not kill the worker, or the browser could never be closed
+        # on its own thread
+        try:
+            job()
+        except Exception as e:
+            print(f"[error] Scrape job failed: {e}\n")
+
 # --- MODIFIED: Added direction_var to arguments ---
 def start_scrape_thread(entry_widget, direction_var):
-    """Starts the scraping process in a separate thread"""
+    """Queues the scraping process on the worker thread"""
     url_or_word = entry_widget.get()
     direction = direction_var.get()
     
@@ -274,17 +604,15 @@ def start_scrape_thread(entry_widget, direction_var):
         except Exception as e:
             print(f"[error] An unexpected error occurred: {e}\n")
         finally:
-            scrape_button.config(state="normal")
+            ui_calls.put(lambda: scrape_button.config(state="normal"))
             
-    thread = threading.Thread(target=scrape_task)
-    thread.daemon = True 
-    thread.start()
+    scrape_jobs.put(scrape_task)
 
 # --- Main Entry Point (Updated) ---
 
 if __name__ == "__main__":
     print("Starting Scraper UI...")
-    print("Please ensure you have run: pip install playwright beautifulsoup4 requests unidecode")
+    print("Please ensure you have run: pip install playwright beautifulsoup4 lxml requests unidecode")
     print("And installed browsers: playwright install")
     print("-" * 30)
     
@@ -330,9 +658,18 @@ if __name__ == "__main__":
     console_output = scrolledtext.ScrolledText(main_frame, height=15, state='disabled')
     console_output.pack(fill="both", expand=True)
 
-    sys.stdout = TextRedirector(console_output)
-    sys.stderr = TextRedirector(console_output)
+    # One redirector for both streams keeps their lines in order
+    sys.stdout = sys.stderr = TextRedirector(console_output)
+    process_ui_calls(root)
+
+    worker = threading.Thread(target=scrape_worker, daemon=True)
+    worker.start()
 
     print("Ready. Select dictionary, then enter a word (e.g., 'chat' or 'cat').")
     
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+    # Let the worker close the browser on its own thread before exiting
+    sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    scrape_jobs.put(None)
+    worker.join(timeout=10)
\ No newline at end of file